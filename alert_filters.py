@@ -0,0 +1,117 @@
+"""
+Filter mask helpers for the alert dashboard.
+Combines the risk threshold and category selections into a single boolean mask.
+"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numexpr as ne
+except ImportError:  # optional, falls back to plain NumPy
+    ne = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # optional, large frames use the numexpr/NumPy path
+    njit = None
+
+
+# Frames with at least this many rows use the fused numba kernel when available
+NUMBA_MIN_ROWS = 100_000
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _fused_mask(risk, min_risk, codes, luts):
+        """Evaluate the whole filter in one parallel pass over the code arrays."""
+        n = risk.shape[0]
+        out = np.empty(n, dtype=np.bool_)
+        for i in prange(n):
+            keep = risk[i] >= min_risk
+            for j in range(codes.shape[0]):
+                keep = keep and luts[j, codes[j, i]]
+            out[i] = keep
+        return out
+
+
+def category_lut(categories: pd.Index, chosen: Iterable[str]) -> np.ndarray:
+    """
+    Build a lookup table marking the chosen categories.
+
+    The table has one extra trailing False entry, so indexing it with a
+    missing-value code (-1) never matches.
+
+    Args:
+        categories: Categories of a categorical column
+        chosen: Labels selected by the user
+
+    Returns:
+        Boolean array indexed by category code
+    """
+    lut = np.zeros(len(categories) + 1, dtype=bool)
+    codes = categories.get_indexer(list(chosen))
+    lut[codes[codes >= 0]] = True
+    return lut
+
+
+def build_filter_mask(df: pd.DataFrame, risk_column: str, min_risk: float,
+                      selections: Dict[str, List[str]]) -> np.ndarray:
+    """
+    Build the combined filter mask for the dashboard.
+
+    Each selection is translated to a per-row boolean via a category lookup
+    table, and the results are ANDed with the risk threshold in one fused
+    numexpr pass when numexpr is installed. Frames of at least NUMBA_MIN_ROWS
+    rows are evaluated by a single numba kernel instead, with no intermediate
+    boolean arrays.
+
+    Args:
+        df: Alert DataFrame; selection columns must be categorical
+        risk_column: Name of the risk score column
+        min_risk: Minimum risk score to keep
+        selections: Column name -> labels to keep
+
+    Returns:
+        Boolean mask with one entry per row of df
+    """
+    risk = df[risk_column].to_numpy()
+    codes = [df[column].cat.codes.to_numpy() for column in selections]
+    luts = [category_lut(df[column].cat.categories, chosen) for column, chosen in selections.items()]
+
+    if njit is not None and selections and len(risk) >= NUMBA_MIN_ROWS:
+        # Pad the lookup tables to one width; the last entry stays False for code -1
+        lut_table = np.zeros((len(luts), max(len(lut) for lut in luts)), dtype=bool)
+        for i, lut in enumerate(luts):
+            lut_table[i, :len(lut) - 1] = lut[:-1]
+        return _fused_mask(risk, min_risk, np.stack(codes), lut_table)
+
+    matches = {f"m{i}": lut[c] for i, (lut, c) in enumerate(zip(luts, codes))}
+
+    if ne is not None:
+        expr = " & ".join(["(risk >= min_risk)", *matches])
+        return ne.evaluate(expr, local_dict={"risk": risk, "min_risk": min_risk, **matches})
+
+    mask = risk >= min_risk
+    for match in matches.values():
+        mask &= match
+    return mask
+
+
+def category_counts(values: pd.Series, mask: np.ndarray) -> pd.Series:
+    """
+    Count each category among the rows selected by mask.
+
+    Args:
+        values: Categorical column of the unfiltered DataFrame
+        mask: Boolean filter mask for that DataFrame
+
+    Returns:
+        Series of counts indexed by category
+    """
+    codes = values.cat.codes.to_numpy()[mask]
+    # Shift by one so missing values (code -1) land in a bin that is dropped
+    counts = np.bincount(codes.astype(np.intp) + 1, minlength=len(values.cat.categories) + 1)[1:]
+    return pd.Series(counts, index=values.cat.categories)
@@ -5,16 +5,19 @@ Loads alerts, scores them, and outputs prioritized list with explanations.
 
 from pathlib import Path
 from datetime import datetime
+
+import pandas as pd
+
 from data_loader import load_alerts
 from scoring_engine import ScoringEngine
 
 
-def print_triage_report(scored_alerts: list, risk_threshold: float = 60.0):
+def print_triage_report(scored_df: pd.DataFrame, risk_threshold: float = 60.0):
     """
     Print a formatted triage report.
     
     Args:
-        scored_alerts: List of ScoredAlert objects
+        scored_df: DataFrame of scored alerts, sorted by risk_score (descending)
         risk_threshold: Risk score threshold for "Critical" classification
     """
     print("\n" + "="*80)
@@ -22,42 +25,43 @@ def print_triage_report(scored_alerts: list, risk_threshold: float = 60.0):
     print("="*80 + "\n")
     
     # Summary statistics
-    critical_count = sum(1 for sa in scored_alerts if sa.priority == "Critical")
-    high_count = sum(1 for sa in scored_alerts if sa.priority == "High")
+    priority_counts = scored_df['priority'].value_counts()
+    critical_count = priority_counts.get("Critical", 0)
+    high_count = priority_counts.get("High", 0)
     
-    print(f"Total Alerts: {len(scored_alerts)}")
-    print(f"Critical: {critical_count} | High: {high_count} | Medium/Low: {len(scored_alerts) - critical_count - high_count}")
+    print(f"Total Alerts: {len(scored_df)}")
+    print(f"Critical: {critical_count} | High: {high_count} | Medium/Low: {len(scored_df) - critical_count - high_count}")
     print(f"Risk Threshold: {risk_threshold}\n")
     print("-"*80 + "\n")
     
     # Detailed alert listing
-    for idx, scored_alert in enumerate(scored_alerts, 1):
-        alert = scored_alert.alert
-        print(f"{idx}. [{scored_alert.priority.upper()}] {alert['alert_id']}")
-        print(f"   Risk Score: {scored_alert.risk_score:.1f}")
-        print(f"   Source: {alert['source']} | Severity: {alert['severity']} | "
-              f"Asset: {alert['asset_type']} | Frequency: {alert['frequency']}")
-        print(f"   Timestamp: {alert['timestamp']}")
-        print(f"   Reason: {scored_alert.explanation}")
+    for idx, alert in enumerate(scored_df.itertuples(index=False), 1):
+        print(f"{idx}. [{alert.priority.upper()}] {alert.alert_id}")
+        print(f"   Risk Score: {alert.risk_score:.1f}")
+        print(f"   Source: {alert.source} | Severity: {alert.severity} | "
+              f"Asset: {alert.asset_type} | Frequency: {alert.frequency}")
+        print(f"   Timestamp: {alert.timestamp}")
+        print(f"   Reason: {alert.explanation}")
         print()
     
     print("-"*80)
     print("Report generated by AI-Assisted SOC Alert Triage")
 
 
-def generate_html_report(scored_alerts: list, risk_threshold: float = 60.0, output_file: str = "alert_triage_report.html"):
+def generate_html_report(scored_df: pd.DataFrame, risk_threshold: float = 60.0, output_file: str = "alert_triage_report.html"):
     """
     Generate an HTML report and save to file.
     
     Args:
-        scored_alerts: List of ScoredAlert objects
+        scored_df: DataFrame of scored alerts, sorted by risk_score (descending)
         risk_threshold: Risk score threshold for "Critical" classification
         output_file: Output HTML filename
     """
-    critical_count = sum(1 for sa in scored_alerts if sa.priority == "Critical")
-    high_count = sum(1 for sa in scored_alerts if sa.priority == "High")
-    medium_count = sum(1 for sa in scored_alerts if sa.priority == "Medium")
-    low_count = sum(1 for sa in scored_alerts if sa.priority == "Low")
+    priority_counts = scored_df['priority'].value_counts()
+    critical_count = priority_counts.get("Critical", 0)
+    high_count = priority_counts.get("High", 0)
+    medium_count = priority_counts.get("Medium", 0)
+    low_count = priority_counts.get("Low", 0)
     
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -263,41 +267,41 @@ def generate_html_report(scored_alerts: list, risk_threshold: float = 60.0, outp
             {"".join(f'''
             <div class="alert-item">
                 <div class="alert-header">
-                    <span class="alert-id">{sa.alert['alert_id']}</span>
-                    <span class="priority-badge {sa.priority.lower()}">{sa.priority}</span>
+                    <span class="alert-id">{alert.alert_id}</span>
+                    <span class="priority-badge {alert.priority.lower()}">{alert.priority}</span>
                 </div>
                 <div class="score-bar">
-                    <div class="score-fill" style="width: {sa.risk_score}%;"></div>
+                    <div class="score-fill" style="width: {alert.risk_score:.1f}%;"></div>
                 </div>
                 <div class="alert-meta">
                     <div class="meta-item">
                         <span class="meta-label">Risk Score:</span>
-                        <span>{sa.risk_score:.1f}/100</span>
+                        <span>{alert.risk_score:.1f}/100</span>
                     </div>
                     <div class="meta-item">
                         <span class="meta-label">Source:</span>
-                        <span>{sa.alert['source']}</span>
+                        <span>{alert.source}</span>
                     </div>
                     <div class="meta-item">
                         <span class="meta-label">Severity:</span>
-                        <span>{sa.alert['severity'].upper()}</span>
+                        <span>{alert.severity.upper()}</span>
                     </div>
                     <div class="meta-item">
                         <span class="meta-label">Asset Type:</span>
-                        <span>{sa.alert['asset_type']}</span>
+                        <span>{alert.asset_type}</span>
                     </div>
                     <div class="meta-item">
                         <span class="meta-label">Frequency:</span>
-                        <span>{sa.alert['frequency']}</span>
+                        <span>{alert.frequency}</span>
                     </div>
                     <div class="meta-item">
                         <span class="meta-label">Timestamp:</span>
-                        <span>{sa.alert['timestamp']}</span>
+                        <span>{alert.timestamp}</span>
                     </div>
                 </div>
-                <div class="explanation">{sa.explanation}</div>
+                <div class="explanation">{alert.explanation}</div>
             </div>
-            ''' for sa in scored_alerts)}
+            ''' for alert in scored_df.itertuples(index=False))}
         </div>
         
         <footer>
@@ -348,18 +352,19 @@ def main():
         )
         
         # Score and prioritize alerts
-        scored_alerts = engine.score_alerts(alerts)
+        scored_df = engine.score_alerts(alerts)
+        scored_df = scored_df.sort_values('risk_score', ascending=False, kind='stable')
         
         # Print report
-        print_triage_report(scored_alerts, risk_threshold)
+        print_triage_report(scored_df, risk_threshold)
         
         # Generate HTML report
-        generate_html_report(scored_alerts, risk_threshold, "alert_triage_report.html")
+        generate_html_report(scored_df, risk_threshold, "alert_triage_report.html")
         
         # Optional: Return top critical alerts
-        critical_alerts = [sa for sa in scored_alerts if sa.priority == "Critical"]
-        if critical_alerts:
-            print(f"\n[ACTION] {len(critical_alerts)} critical alert(s) require immediate investigation.")
+        critical_count = (scored_df['priority'] == "Critical").sum()
+        if critical_count:
+            print(f"\n[ACTION] {critical_count} critical alert(s) require immediate investigation.")
         
     except FileNotFoundError as e:
         print(f"Error: {e}")
@@ -3,10 +3,21 @@ Streamlit dashboard for SOC Alert Triage
 Interactive filtering and exploration of prioritized alerts
 """
 
+import io
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-from data_loader import load_alerts
+from data_loader import load_alerts_cached
 from scoring_engine import ScoringEngine
+from alert_filters import build_filter_mask, category_counts
+from frame_hashing import frame_digest
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # optional, falls back to DataFrame.to_csv
+    pa = pa_csv = None
 
 
 # Page configuration
@@ -33,6 +44,20 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Number of alert detail cards rendered per page
+ALERTS_PER_PAGE = 20
+
+# Encoded CSV downloads kept in memory (one per distinct filter result)
+CSV_CACHE_ENTRIES = 8
+
+# Color code by priority
+PRIORITY_ICONS = {
+    'Critical': '🔴',
+    'High': '🟠',
+    'Medium': '🔵',
+    'Low': '🟢'
+}
+
 # Title and description
 st.title("🚨 SOC Alert Triage Dashboard")
 st.markdown("**Interactive alert filtering and risk assessment**")
@@ -41,40 +66,60 @@ st.markdown("**Interactive alert filtering and risk assessment**")
 @st.cache_data
 def load_and_score_alerts():
     try:
-        alerts = load_alerts("mock_alerts.json")
         engine = ScoringEngine(
             severity_weights={'low': 20, 'medium': 50, 'high': 90},
             asset_weights={'standard': 10, 'important': 50, 'critical': 100},
             frequency_factor=0.1,
             risk_threshold=60.0
         )
-        scored_alerts = engine.score_alerts(alerts)
-        return scored_alerts
+        scored = load_alerts_cached("mock_alerts.json", engine)
+        # Sort once here; boolean filtering below preserves this order
+        return scored.sort_values('risk_score', ascending=False, kind='stable', ignore_index=True)
     except Exception as e:
         st.error(f"Error loading alerts: {e}")
-        return []
+        return pd.DataFrame()
+
+
+@st.cache_data(max_entries=CSV_CACHE_ENTRIES)
+def make_csv(df_hash: str, _df: pd.DataFrame) -> bytes:
+    """
+    Encode filtered alerts as CSV; only re-runs when df_hash changes.
+    
+    The pyarrow writer quotes the header and every text field, unlike
+    DataFrame.to_csv, which only quotes fields containing separators.
+    """
+    if pa_csv is not None:
+        buffer = io.BytesIO()
+        pa_csv.write_csv(pa.Table.from_pandas(_df, preserve_index=False), buffer)
+        return buffer.getvalue()
+    return _df.to_csv(index=False).encode()
 
-scored_alerts = load_and_score_alerts()
+scored_df = load_and_score_alerts()
 
-if not scored_alerts:
+if scored_df.empty:
     st.error("No alerts loaded. Check mock_alerts.json")
     st.stop()
 
-# Convert to DataFrame for easier filtering
-df = pd.DataFrame([
-    {
-        'Alert ID': sa.alert['alert_id'],
-        'Risk Score': sa.risk_score,
-        'Priority': sa.priority,
-        'Severity': sa.alert['severity'].upper(),
-        'Asset Type': sa.alert['asset_type'],
-        'Frequency': sa.alert['frequency'],
-        'Source': sa.alert['source'],
-        'Timestamp': sa.alert['timestamp'],
-        'Reason': sa.explanation
-    }
-    for sa in scored_alerts
-])
+# Rename columns for display
+df = scored_df[[
+    'alert_id', 'risk_score', 'priority', 'severity', 'asset_type',
+    'frequency', 'source', 'timestamp', 'explanation'
+]].rename(columns={
+    'alert_id': 'Alert ID',
+    'risk_score': 'Risk Score',
+    'priority': 'Priority',
+    'severity': 'Severity',
+    'asset_type': 'Asset Type',
+    'frequency': 'Frequency',
+    'source': 'Source',
+    'timestamp': 'Timestamp',
+    'explanation': 'Reason'
+})
+
+# Low-cardinality columns are categorical so filtering works on small integer codes
+for col in ('Severity', 'Asset Type', 'Priority', 'Source'):
+    df[col] = df[col].astype('category')
+df['Severity'] = df['Severity'].cat.rename_categories(str.upper)
 
 # Sidebar filters
 st.sidebar.header("🎯 Filters")
@@ -92,63 +137,62 @@ risk_threshold = st.sidebar.slider(
 # Severity Filter
 severities = st.sidebar.multiselect(
     "Severity Level",
-    options=sorted(df['Severity'].unique()),
-    default=sorted(df['Severity'].unique()),
+    options=list(df['Severity'].cat.categories),
+    default=list(df['Severity'].cat.categories),
     help="Filter by alert severity"
 )
 
 # Asset Type Filter
 asset_types = st.sidebar.multiselect(
     "Asset Type",
-    options=sorted(df['Asset Type'].unique()),
-    default=sorted(df['Asset Type'].unique()),
+    options=list(df['Asset Type'].cat.categories),
+    default=list(df['Asset Type'].cat.categories),
     help="Filter by asset type"
 )
 
 # Priority Filter
 priorities = st.sidebar.multiselect(
     "Priority Level",
-    options=['Critical', 'High', 'Medium', 'Low'],
-    default=['Critical', 'High', 'Medium', 'Low'],
+    options=list(df['Priority'].cat.categories),
+    default=list(df['Priority'].cat.categories),
     help="Filter by triage priority"
 )
 
 # Source Filter
 sources = st.sidebar.multiselect(
     "Alert Source",
-    options=sorted(df['Source'].unique()),
-    default=sorted(df['Source'].unique()),
+    options=list(df['Source'].cat.categories),
+    default=list(df['Source'].cat.categories),
     help="Filter by alert source (IDS, EDR, SIEM, etc.)"
 )
 
 # Apply filters
-filtered_df = df[
-    (df['Risk Score'] >= risk_threshold) &
-    (df['Severity'].isin(severities)) &
-    (df['Asset Type'].isin(asset_types)) &
-    (df['Priority'].isin(priorities)) &
-    (df['Source'].isin(sources))
-]
+filter_mask = build_filter_mask(df, 'Risk Score', risk_threshold, {
+    'Severity': severities,
+    'Asset Type': asset_types,
+    'Priority': priorities,
+    'Source': sources,
+})
+filtered_df = df[filter_mask]
 
 # Display summary metrics
 st.header("📊 Summary")
 col1, col2, col3, col4, col5 = st.columns(5)
 
+# Count every priority with one bincount over the masked category codes
+priority_counts = category_counts(df['Priority'], filter_mask)
+
 with col1:
-    critical_count = len(filtered_df[filtered_df['Priority'] == 'Critical'])
-    st.metric("🔴 Critical", critical_count)
+    st.metric("🔴 Critical", int(priority_counts.get('Critical', 0)))
 
 with col2:
-    high_count = len(filtered_df[filtered_df['Priority'] == 'High'])
-    st.metric("🟠 High", high_count)
+    st.metric("🟠 High", int(priority_counts.get('High', 0)))
 
 with col3:
-    medium_count = len(filtered_df[filtered_df['Priority'] == 'Medium'])
-    st.metric("🔵 Medium", medium_count)
+    st.metric("🔵 Medium", int(priority_counts.get('Medium', 0)))
 
 with col4:
-    low_count = len(filtered_df[filtered_df['Priority'] == 'Low'])
-    st.metric("🟢 Low", low_count)
+    st.metric("🟢 Low", int(priority_counts.get('Low', 0)))
 
 with col5:
     avg_risk = filtered_df['Risk Score'].mean() if len(filtered_df) > 0 else 0
@@ -162,42 +206,56 @@ st.header(f"🔍 Alerts ({len(filtered_df)} results)")
 if len(filtered_df) == 0:
     st.warning("No alerts match the selected filters.")
 else:
-    # Sort by risk score descending
-    filtered_df_sorted = filtered_df.sort_values('Risk Score', ascending=False)
+    # Display all matching alerts as a single table
+    st.dataframe(
+        filtered_df,
+        column_config={
+            'Risk Score': st.column_config.ProgressColumn(
+                'Risk Score', format='%.1f', min_value=0, max_value=100
+            ),
+            'Reason': st.column_config.TextColumn('Reason', width='large'),
+        },
+        hide_index=True
+    )
     
-    # Display as expandable cards
-    for idx, row in filtered_df_sorted.iterrows():
-        # Color code by priority
-        priority_color = {
-            'Critical': '🔴',
-            'High': '🟠',
-            'Medium': '🔵',
-            'Low': '🟢'
-        }
-        
-        with st.expander(
-            f"{priority_color.get(row['Priority'], '⚪')} {row['Alert ID']} | "
-            f"Risk: {row['Risk Score']:.1f} | {row['Priority'].upper()}"
-        ):
+    # Detailed cards are paginated so each rerun renders at most ALERTS_PER_PAGE expanders
+    st.subheader("Alert Details")
+    page_count = (len(filtered_df) - 1) // ALERTS_PER_PAGE + 1
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    page_start = (page - 1) * ALERTS_PER_PAGE
+    page_df = filtered_df.iloc[page_start:page_start + ALERTS_PER_PAGE]
+    st.caption(f"Showing alerts {page_start + 1}-{page_start + len(page_df)} of {len(filtered_df)}")
+    
+    # Build all expander labels for the page at once
+    priority_labels = page_df['Priority'].astype(str)
+    page_labels = (
+        priority_labels.map(PRIORITY_ICONS).fillna('⚪') + ' ' + page_df['Alert ID'].astype(str)
+        + ' | Risk: ' + np.char.mod('%.1f', page_df['Risk Score'].to_numpy())
+        + ' | ' + priority_labels.str.upper()
+    )
+    
+    for label, row in zip(page_labels, page_df.to_dict('records')):
+        with st.expander(label):
             col1, col2 = st.columns(2)
             
-            with col1:
-                st.write(f"**Risk Score:** {row['Risk Score']:.1f}/100")
-                st.write(f"**Severity:** {row['Severity']}")
-                st.write(f"**Frequency:** {row['Frequency']} occurrences")
-                st.write(f"**Timestamp:** {row['Timestamp']}")
-            
-            with col2:
-                st.write(f"**Priority:** {row['Priority']}")
-                st.write(f"**Asset Type:** {row['Asset Type']}")
-                st.write(f"**Source:** {row['Source']}")
+            # One markdown element per column keeps the number of frontend messages low
+            col1.markdown(
+                f"**Risk Score:** {row['Risk Score']:.1f}/100  \n"
+                f"**Severity:** {row['Severity']}  \n"
+                f"**Frequency:** {row['Frequency']} occurrences  \n"
+                f"**Timestamp:** {row['Timestamp']}"
+            )
+            col2.markdown(
+                f"**Priority:** {row['Priority']}  \n"
+                f"**Asset Type:** {row['Asset Type']}  \n"
+                f"**Source:** {row['Source']}"
+            )
             
-            st.markdown("---")
-            st.write(f"**Explanation:** {row['Reason']}")
+            st.markdown(f"---\n\n**Explanation:** {row['Reason']}")
     
     # Option to download filtered data
     st.divider()
-    csv = filtered_df_sorted.to_csv(index=False)
+    csv = make_csv(frame_digest(filtered_df), filtered_df)
     st.download_button(
         label="📥 Download Filtered Alerts (CSV)",
         data=csv,
@@ -4,31 +4,144 @@ Handles normalization and validation of alert data.
 """
 
 import json
-import csv
+import hashlib
+import mmap
+import os
+import tempfile
 from pathlib import Path
 from typing import List, Dict, Any
 
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib parser
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # optional, falls back to the pandas C parser
+    pa = pa_csv = None
+
+try:
+    import ijson
+except ImportError:  # optional, large JSON files are parsed in one go
+    ijson = None
+
+
+# Files at least this large are memory-mapped instead of read into a copy
+MMAP_THRESHOLD_BYTES = 16 * 1024 * 1024
+
+# JSON files at least this large are streamed with ijson instead of parsed in memory
+STREAM_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# Alerts per Arrow record batch when streaming JSON
+STREAM_BATCH_ROWS = 65_536
+
+# CSV files at least this large are parsed with the multi-threaded pyarrow reader
+PYARROW_CSV_THRESHOLD_BYTES = 16 * 1024 * 1024
+
+# Column types for CSV parsing; text columns stay strings (timestamps are not parsed)
+CSV_DTYPES = {
+    'alert_id': 'str',
+    'source': 'str',
+    'timestamp': 'str',
+    'severity': 'category',
+    'asset_type': 'category',
+}
+
+# Fields every alert must provide
+REQUIRED_FIELDS = ('alert_id', 'source', 'severity', 'asset_type', 'frequency', 'timestamp')
+
+# Bump when the layout of the cached scored DataFrame changes
+CACHE_VERSION = 4
+
 
 def load_json(file_path: str) -> List[Dict[str, Any]]:
-    """Load alerts from a JSON file."""
-    with open(file_path, 'r') as f:
-        alerts = json.load(f)
+    """Load alerts from a JSON file (uses orjson when installed)."""
+    if orjson is None:
+        with open(file_path, 'r') as f:
+            alerts = json.load(f)
+    else:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as buf:
+                        alerts = orjson.loads(buf)
+            else:
+                alerts = orjson.loads(f.read())
     return alerts if isinstance(alerts, list) else [alerts]
 
 
-def load_csv(file_path: str) -> List[Dict[str, Any]]:
-    """Load alerts from a CSV file."""
-    alerts = []
-    with open(file_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert frequency to int
-            row['frequency'] = int(row['frequency'])
-            alerts.append(row)
-    return alerts
+def load_json_stream(file_path: str, batch_size: int = STREAM_BATCH_ROWS) -> "pa.Table":
+    """
+    Stream alerts from a JSON file into a pyarrow Table.
+    
+    Records are parsed incrementally with ijson and converted to Arrow
+    columns batch by batch, so peak memory stays around one batch on top of
+    the columnar result. Only REQUIRED_FIELDS are kept, all as strings;
+    normalize_alerts() converts frequency.
+    
+    Args:
+        file_path: Path to a JSON file containing an array of alerts (or a single alert object)
+        batch_size: Alerts per record batch
+        
+    Returns:
+        pyarrow Table with one column per required field
+    """
+    if ijson is None or pa is None:
+        raise ImportError("Streaming JSON requires the ijson and pyarrow packages")
+    
+    schema = pa.schema([(field, pa.string()) for field in REQUIRED_FIELDS])
+    batches = []
+    columns = {field: [] for field in REQUIRED_FIELDS}
+    
+    def flush():
+        batches.append(pa.RecordBatch.from_arrays(
+            [pa.array(columns[field], type=pa.string()) for field in REQUIRED_FIELDS],
+            schema=schema
+        ))
+        for values in columns.values():
+            values.clear()
+    
+    with open(file_path, 'rb') as f:
+        # A single top-level object is one alert, matching load_json()
+        first_char = b''
+        while not first_char:
+            chunk = f.read(4096)
+            if not chunk:
+                break
+            first_char = chunk.lstrip()[:1]
+        f.seek(0)
+        prefix = '' if first_char == b'{' else 'item'
+        for alert in ijson.items(f, prefix):
+            for field, values in columns.items():
+                value = alert.get(field)
+                values.append(None if value is None else str(value))
+            if len(columns['alert_id']) >= batch_size:
+                flush()
+    
+    if columns['alert_id']:
+        flush()
+    
+    return pa.Table.from_batches(batches, schema=schema)
+
+
+def load_csv(file_path: str) -> pd.DataFrame:
+    """Load alerts from a CSV file (uses pyarrow for large files when installed)."""
+    if pa_csv is not None and os.path.getsize(file_path) >= PYARROW_CSV_THRESHOLD_BYTES:
+        # Empty cells become nulls, matching the NaNs the pandas parser produces
+        convert_options = pa_csv.ConvertOptions(
+            column_types={column: pa.string() for column, dtype in CSV_DTYPES.items() if dtype == 'str'},
+            strings_can_be_null=True
+        )
+        return pa_csv.read_csv(file_path, convert_options=convert_options).to_pandas()
+    return pd.read_csv(file_path, dtype=CSV_DTYPES)
 
 
-def load_alerts(file_path: str) -> List[Dict[str, Any]]:
+def load_alerts(file_path: str) -> pd.DataFrame:
     """
     Load alerts from JSON or CSV file based on extension.
     
@@ -36,7 +149,7 @@ def load_alerts(file_path: str) -> List[Dict[str, Any]]:
         file_path: Path to alert file (.json or .csv)
         
     Returns:
-        List of normalized alert dictionaries
+        DataFrame of normalized alerts, one row per alert
     """
     path = Path(file_path)
     
@@ -44,7 +157,10 @@ def load_alerts(file_path: str) -> List[Dict[str, Any]]:
         raise FileNotFoundError(f"Alert file not found: {file_path}")
     
     if path.suffix.lower() == '.json':
-        alerts = load_json(file_path)
+        if ijson is not None and pa is not None and path.stat().st_size >= STREAM_THRESHOLD_BYTES:
+            alerts = load_json_stream(file_path).to_pandas()
+        else:
+            alerts = load_json(file_path)
     elif path.suffix.lower() == '.csv':
         alerts = load_csv(file_path)
     else:
@@ -53,37 +169,114 @@ def load_alerts(file_path: str) -> List[Dict[str, Any]]:
     return normalize_alerts(alerts)
 
 
-def normalize_alerts(alerts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def load_alerts_cached(file_path: str, engine, cache_dir: str = ".cache") -> pd.DataFrame:
+    """
+    Load and score alerts, reusing a Feather copy of the result on disk.
+    
+    The cache key covers the file's path, modification time and size plus the
+    scoring engine configuration, so changing any of them re-runs the pipeline.
+    Older cache entries for the same alert file are removed once a new one is
+    written. If the result cannot be cached it is still returned.
+    
+    Args:
+        file_path: Path to alert file (.json or .csv)
+        engine: ScoringEngine used to score the alerts
+        cache_dir: Directory holding cached Feather files
+        
+    Returns:
+        DataFrame of scored alerts
+    """
+    path = Path(file_path)
+    
+    if not path.exists():
+        raise FileNotFoundError(f"Alert file not found: {file_path}")
+    
+    stat = path.stat()
+    key_source = repr((
+        CACHE_VERSION,
+        str(path.resolve()),
+        stat.st_mtime_ns,
+        stat.st_size,
+        sorted(engine.severity_weights.items()),
+        sorted(engine.asset_weights.items()),
+        engine.frequency_factor,
+        engine.risk_threshold,
+    ))
+    key = hashlib.blake2b(key_source.encode(), digest_size=16).hexdigest()
+    # Entries for the same alert file share a prefix so stale ones can be pruned
+    file_key = hashlib.blake2b(str(path.resolve()).encode(), digest_size=8).hexdigest()
+    cache_path = Path(cache_dir)
+    cache_file = cache_path / f"{file_key}-{key}.feather"
+    
+    if cache_file.exists():
+        return pd.read_feather(cache_file)
+    
+    df = engine.score_alerts(load_alerts(file_path))
+    
+    # Write to a uniquely named temporary file first so a crash or a concurrent
+    # session never leaves a partial cache entry
+    write_errors = (ImportError, OSError) + ((pa.ArrowException,) if pa is not None else ())
+    tmp_name = None
+    try:
+        cache_path.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_path, suffix=".tmp", delete=False) as tmp:
+            tmp_name = tmp.name
+        df.to_feather(tmp_name)
+        os.replace(tmp_name, cache_file)
+        tmp_name = None
+    except write_errors as e:
+        print(f"Warning: Could not write alert cache {cache_file}: {e}")
+    finally:
+        if tmp_name is not None and os.path.exists(tmp_name):
+            os.remove(tmp_name)
+    
+    # Drop entries left over from earlier versions of this alert file
+    for stale_file in cache_path.glob(f"{file_key}-*.feather"):
+        if stale_file != cache_file:
+            try:
+                stale_file.unlink()
+            except OSError:
+                pass
+    
+    return df
+
+
+def normalize_alerts(alerts) -> pd.DataFrame:
     """
     Normalize alert data for consistency.
     Ensures required fields exist and are in expected format.
     
     Args:
-        alerts: Raw alert data
+        alerts: Raw alert data (list of dictionaries or DataFrame)
         
     Returns:
-        List of normalized alerts
+        DataFrame of normalized alerts, one row per alert
     """
-    required_fields = {'alert_id', 'source', 'severity', 'asset_type', 'frequency', 'timestamp'}
-    normalized = []
-    
-    for alert in alerts:
-        # Check required fields
-        missing = required_fields - set(alert.keys())
-        if missing:
-            print(f"Warning: Alert {alert.get('alert_id', '?')} missing fields: {missing}")
-            continue
-        
-        # Normalize severity to lowercase
-        alert['severity'] = alert['severity'].lower()
-        
-        # Ensure frequency is an integer
-        try:
-            alert['frequency'] = int(alert['frequency'])
-        except (ValueError, TypeError):
-            print(f"Warning: Alert {alert['alert_id']} has invalid frequency: {alert['frequency']}")
-            continue
-        
-        normalized.append(alert)
+    df = pd.DataFrame(alerts)
+    df = df.reindex(columns=[*df.columns, *(f for f in REQUIRED_FIELDS if f not in df.columns)])
+    
+    # Check required fields
+    missing = df[list(REQUIRED_FIELDS)].isna()
+    has_missing = missing.any(axis=1)
+    for alert_id, row in zip(df.loc[has_missing, 'alert_id'], missing[has_missing].to_numpy()):
+        missing_fields = {f for f, is_missing in zip(REQUIRED_FIELDS, row) if is_missing}
+        print(f"Warning: Alert {'?' if pd.isna(alert_id) else alert_id} missing fields: {missing_fields}")
+    df = df[~has_missing]
+    
+    # Ensure frequency is an integer; fractions are truncated like int() and
+    # huge counts are clipped to the int32 range (the risk score caps at 100 anyway)
+    frequency = pd.to_numeric(df['frequency'], errors='coerce').astype('float64')
+    invalid = ~np.isfinite(frequency)
+    for alert_id, value in zip(df.loc[invalid, 'alert_id'], df.loc[invalid, 'frequency']):
+        print(f"Warning: Alert {alert_id} has invalid frequency: {value}")
+    int32_info = np.iinfo(np.int32)
+    frequency = np.trunc(frequency[~invalid]).clip(int32_info.min, int32_info.max)
+    df = df[~invalid].assign(frequency=frequency.astype('int32'))
+    
+    # Normalize severity to lowercase; low-cardinality columns are stored as categoricals
+    df['severity'] = df['severity'].astype(str).str.lower().astype('category')
+    # Categories of dropped rows (e.g. from pre-categorized CSV columns) are removed
+    df['asset_type'] = df['asset_type'].astype('category').cat.remove_unused_categories()
+    df['source'] = df['source'].astype('category').cat.remove_unused_categories()
     
-    return normalized
+    return df.reset_index(drop=True)